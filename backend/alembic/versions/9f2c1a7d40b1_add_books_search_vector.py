@@ -0,0 +1,26 @@
+"""Add generated tsvector column and GIN index for book search
+
+Revision ID: 9f2c1a7d40b1
+Revises:
+Create Date: 2026-08-26
+
+"""
+from alembic import op
+
+revision = "9f2c1a7d40b1"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "ALTER TABLE books ADD COLUMN search_vec tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(author, ''))) STORED"
+    )
+    op.execute("CREATE INDEX books_search_idx ON books USING GIN (search_vec)")
+
+
+def downgrade():
+    op.execute("DROP INDEX books_search_idx")
+    op.execute("ALTER TABLE books DROP COLUMN search_vec")
@@ -0,0 +1,23 @@
+"""Add unique (user_id, genre) constraint on user_preferences
+
+Revision ID: a94d27e0c3f6
+Revises: f2c740a1d5b8
+Create Date: 2026-08-26
+
+"""
+from alembic import op
+
+revision = "a94d27e0c3f6"
+down_revision = "f2c740a1d5b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_unique_constraint(
+        "uq_user_preferences_user_genre", "user_preferences", ["user_id", "genre"]
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_user_preferences_user_genre", "user_preferences", type_="unique")
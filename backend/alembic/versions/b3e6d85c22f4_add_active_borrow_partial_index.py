@@ -0,0 +1,27 @@
+"""Add partial index for active-borrow lookups
+
+Revision ID: b3e6d85c22f4
+Revises: 9f2c1a7d40b1
+Create Date: 2026-08-26
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b3e6d85c22f4"
+down_revision = "9f2c1a7d40b1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_borrows_active_user_book",
+        "borrows",
+        ["user_id", "book_id"],
+        postgresql_where=sa.text("returned_at IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_borrows_active_user_book", table_name="borrows")
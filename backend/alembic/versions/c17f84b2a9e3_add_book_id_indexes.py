@@ -0,0 +1,23 @@
+"""Add book_id indexes on borrows and reviews
+
+Revision ID: c17f84b2a9e3
+Revises: a94d27e0c3f6
+Create Date: 2026-08-26
+
+"""
+from alembic import op
+
+revision = "c17f84b2a9e3"
+down_revision = "a94d27e0c3f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_borrows_book_id", "borrows", ["book_id"])
+    op.create_index("ix_reviews_book_id", "reviews", ["book_id"])
+
+
+def downgrade():
+    op.drop_index("ix_reviews_book_id", table_name="reviews")
+    op.drop_index("ix_borrows_book_id", table_name="borrows")
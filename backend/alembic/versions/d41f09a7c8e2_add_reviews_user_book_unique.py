@@ -0,0 +1,21 @@
+"""Add unique (user_id, book_id) constraint on reviews
+
+Revision ID: d41f09a7c8e2
+Revises: b3e6d85c22f4
+Create Date: 2026-08-26
+
+"""
+from alembic import op
+
+revision = "d41f09a7c8e2"
+down_revision = "b3e6d85c22f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_unique_constraint("uq_reviews_user_book", "reviews", ["user_id", "book_id"])
+
+
+def downgrade():
+    op.drop_constraint("uq_reviews_user_book", "reviews", type_="unique")
@@ -0,0 +1,21 @@
+"""Add composite (user_id, book_id) index on borrows
+
+Revision ID: e8a51c3b96d7
+Revises: d41f09a7c8e2
+Create Date: 2026-08-26
+
+"""
+from alembic import op
+
+revision = "e8a51c3b96d7"
+down_revision = "d41f09a7c8e2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_borrows_user_book", "borrows", ["user_id", "book_id"])
+
+
+def downgrade():
+    op.drop_index("ix_borrows_user_book", table_name="borrows")
@@ -0,0 +1,21 @@
+"""Add index on books.created_at
+
+Revision ID: f2c740a1d5b8
+Revises: e8a51c3b96d7
+Create Date: 2026-08-26
+
+"""
+from alembic import op
+
+revision = "f2c740a1d5b8"
+down_revision = "e8a51c3b96d7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_books_created_at", "books", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_books_created_at", table_name="books")
@@ -1,17 +1,52 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Argon2id with OWASP-recommended parameters (m=46 MiB, t=3, p=1).
+_hasher = PasswordHasher(time_cost=3, memory_cost=46 * 1024, parallelism=1, hash_len=32, salt_len=16)
+
+
+def _prehash(password: str) -> str:
+    """Digest the password to a fixed 64-char hex string before Argon2.
+
+    Caps Argon2's input at 32 bytes no matter how large the submitted
+    password is, so oversized request bodies can't inflate per-request CPU.
+    """
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _hasher.hash(_prehash(password))
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    try:
+        return _hasher.verify(hashed, _prehash(plain))
+    except (VerifyMismatchError, InvalidHashError):
+        return False
+
+
+# Hash of a random throwaway password, used to keep login timing flat when the
+# email doesn't exist (otherwise response time leaks which emails are registered).
+_DUMMY_HASH = _hasher.hash("dummy-" + secrets.token_hex(8))
+
+
+def verify_dummy_password(plain: str) -> bool:
+    """Burn the same CPU as a real verification; always returns False."""
+    verify_password(plain, _DUMMY_HASH)
+    return False
+
+
+def password_needs_rehash(hashed: str) -> bool:
+    """True if the stored hash was created with outdated parameters."""
+    try:
+        return _hasher.check_needs_rehash(hashed)
+    except InvalidHashError:
+        return True
 
 
 def create_token(data: dict) -> str:
@@ -1,12 +1,25 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import NullPool
 from sqlalchemy.orm import declarative_base
 from app.config import settings
 
+# Pool kwargs don't apply to sqlite (used for local smoke testing), which
+# keeps its driver default pooling.
+_pool_kwargs = {}
+if not settings.database_url.startswith("sqlite"):
+    _pool_kwargs = {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_timeout": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
-    poolclass=NullPool,
+    # Large enough that every hot statement stays in the compiled-SQL cache.
+    query_cache_size=1200,
+    **_pool_kwargs,
 )
 SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
@@ -1,6 +1,8 @@
+from functools import lru_cache
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import decode_token
@@ -17,14 +19,23 @@ from app.storage.s3 import S3Storage
 
 security = HTTPBearer(auto_error=False)
 
+# Built once at import so per-request work is just a cache lookup + bind.
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
 
+@lru_cache(maxsize=1)
 def get_storage() -> StorageBackend:
+    # One backend per process; settings are immutable after startup, and
+    # tests can still swap it via dependency_overrides or cache_clear().
     if settings.storage_provider == "s3":
         return S3Storage()
     return LocalStorage(settings.local_storage_path)
 
 
+@lru_cache(maxsize=1)
 def get_llm() -> LLMBackend:
+    # One provider instance per process so its pooled HTTP client is shared
+    # across requests; the lifespan closes it on shutdown.
     if settings.llm_provider == "ollama":
         return OllamaLLM()
     if settings.llm_provider == "openai":
@@ -41,7 +52,7 @@ async def get_current_user(
     payload = decode_token(creds.credentials)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    result = await db.execute(select(User).where(User.id == int(payload["sub"])))
+    result = await db.execute(USER_BY_ID, {"user_id": int(payload["sub"])})
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
@@ -57,6 +68,6 @@ async def get_optional_user(
     payload = decode_token(creds.credentials)
     if not payload or "sub" not in payload:
         return None
-    result = await db.execute(select(User).where(User.id == int(payload["sub"])))
+    result = await db.execute(USER_BY_ID, {"user_id": int(payload["sub"])})
     return result.scalar_one_or_none()
 
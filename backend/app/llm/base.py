@@ -11,6 +11,10 @@ class LLMBackend(ABC):
     async def analyze_sentiment(self, reviews: list[str]) -> str:
         pass
 
+    async def aclose(self) -> None:
+        """Release any pooled network resources. No-op for local backends."""
+        return None
+
     async def recommend_similar(self, book_info: str, candidates: list[dict[str, Any]], limit: int = 10) -> list[int]:
         return []
 
@@ -0,0 +1,43 @@
+import hashlib
+import time
+
+
+class TTLCache:
+    """Small in-process TTL cache for deterministic LLM calls.
+
+    LLM output is fixed for a fixed (model, input) pair, so repeat calls can
+    be served from memory instead of paying the model round-trip again.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, str]] = {}
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            # Evict the entry closest to expiry; cheap and good enough at this size.
+            oldest = min(self._entries, key=lambda k: self._entries[k][0])
+            del self._entries[oldest]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+def summary_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"summary:{model}:{text}".encode()).hexdigest()
+
+
+def sentiment_key(model: str, reviews: list[str]) -> str:
+    # Key on sorted per-review hashes so the same set of reviews hits the
+    # cache regardless of fetch order.
+    review_hashes = sorted(hashlib.sha256(r.encode()).hexdigest() for r in reviews)
+    return hashlib.sha256(f"sentiment:{model}:{','.join(review_hashes)}".encode()).hexdigest()
@@ -1,5 +1,29 @@
+import re
+
 from app.llm.base import LLMBackend
 
+# Compiled once at import: one alternation pass per polarity over the joined
+# reviews, instead of scanning the text once per keyword.
+_POS_RE = re.compile(
+    r"\b(?:excellent|amazing|love(?:d|ly)?|great|wonderful|fantastic|enjoyable|brilliant|captivating)\b",
+    re.IGNORECASE,
+)
+_NEG_RE = re.compile(
+    r"\b(?:terrible|awful|boring|hated?|disappointing|bad|dull|weak|tedious)\b",
+    re.IGNORECASE,
+)
+
+
+def _overall_tone(reviews: list[str]) -> str:
+    joined = " ".join(reviews)
+    pos = len(_POS_RE.findall(joined))
+    neg = len(_NEG_RE.findall(joined))
+    if pos > neg:
+        return "largely positive"
+    if neg > pos:
+        return "largely negative"
+    return "mixed"
+
 
 class MockLLM(LLMBackend):
     async def summarize(self, text: str) -> str:
@@ -17,7 +41,7 @@ class MockLLM(LLMBackend):
         if len(snippets) == 1:
             return f"One reader noted: {snippets[0]}{'...' if len(reviews[0]) > 100 else '.'}"
         themes = "; ".join(snippets) if len(snippets) <= 2 else "; ".join(snippets[:2]) + f" (and {len(snippets) - 2} more)"
-        return f"Readers shared mixed perspectives. Recurring themes: {themes}"
+        return f"Readers shared {_overall_tone(reviews)} perspectives. Recurring themes: {themes}"
 
     async def recommend_similar(self, book_info: str, candidates: list[dict], limit: int = 10) -> list[int]:
         return [c["id"] for c in candidates[:limit]]
@@ -1,13 +1,14 @@
-import json
 import logging
 import re
 
 import httpx
+import orjson
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 from app.llm.base import LLMBackend
+from app.llm.cache import TTLCache, sentiment_key, summary_key
 from app.llm.prompts import (
     recommend_for_user_prompt,
     recommend_similar_prompt,
@@ -62,22 +63,31 @@ class OllamaLLM(LLMBackend):
     def __init__(self):
         self.base = settings.ollama_base_url.rstrip("/")
         self.model = getattr(settings, "ollama_model", "llama3.2") or "llama3.2"
+        # One client for the provider's lifetime: keep-alive connections are
+        # reused across calls instead of paying a TCP handshake per request.
+        self._client = httpx.AsyncClient(
+            timeout=120.0,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+        self._cache = TTLCache()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
 
     async def _call(self, prompt: str, system: str = "") -> str:
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                r = await client.post(
-                    f"{self.base}/api/generate",
-                    json={"model": self.model, "prompt": prompt, "system": system or "You are helpful."},
-                )
-                r.raise_for_status()
-                out = []
-                async for line in r.aiter_lines():
-                    if line:
-                        d = json.loads(line)
-                        if "response" in d:
-                            out.append(d["response"])
-                return "".join(out).strip() or "No response."
+            r = await self._client.post(
+                f"{self.base}/api/generate",
+                json={"model": self.model, "prompt": prompt, "system": system or "You are helpful."},
+            )
+            r.raise_for_status()
+            out = []
+            async for line in r.aiter_lines():
+                if line:
+                    d = orjson.loads(line)
+                    if "response" in d:
+                        out.append(d["response"])
+            return "".join(out).strip() or "No response."
         except Exception as e:
             logger.warning("Ollama _call failed: %s", e, exc_info=True)
             return ""
@@ -85,14 +95,28 @@ class OllamaLLM(LLMBackend):
     async def summarize(self, text: str) -> str:
         if not text or len(text.strip()) < 10:
             return "Summary not available."
+        key = summary_key(self.model, text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
         prompt, system = summary_prompt(text)
-        return await self._call(prompt, system)
+        out = await self._call(prompt, system)
+        if out and out != "No response.":
+            self._cache.set(key, out)
+        return out
 
     async def analyze_sentiment(self, reviews: list[str]) -> str:
         if not reviews:
             return "No reviews yet."
+        key = sentiment_key(self.model, reviews)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
         prompt, system = sentiment_prompt(reviews)
-        return await self._call(prompt, system)
+        out = await self._call(prompt, system)
+        if out and out != "No response.":
+            self._cache.set(key, out)
+        return out
 
     async def recommend_similar(self, book_info: str, candidates: list[dict], limit: int = 10) -> list[int]:
         if not candidates:
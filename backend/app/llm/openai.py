@@ -2,6 +2,7 @@ import re
 
 from app.config import settings
 from app.llm.base import LLMBackend
+from app.llm.cache import TTLCache, sentiment_key, summary_key
 from app.llm.prompts import (
     recommend_for_user_prompt,
     recommend_similar_prompt,
@@ -24,13 +25,28 @@ def _parse_id_list(text: str) -> list[int]:
 class OpenAILLM(LLMBackend):
     def __init__(self):
         self.model = settings.openai_model or "gpt-4o-mini"
+        self._client = None
+        self._cache = TTLCache()
+
+    def _get_client(self):
+        # Built lazily once and reused: the SDK client owns a connection pool,
+        # and recreating it per call would redo the TLS handshake every time.
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=settings.openai_api_key)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
 
     async def _call(self, prompt: str, system: str = "") -> str:
         if not settings.openai_api_key:
             return ""
         try:
-            from openai import AsyncOpenAI
-            client = AsyncOpenAI(api_key=settings.openai_api_key)
+            client = self._get_client()
             resp = await client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -48,14 +64,28 @@ class OpenAILLM(LLMBackend):
     async def summarize(self, text: str) -> str:
         if not text or len(text.strip()) < 10:
             return "Summary not available."
+        key = summary_key(self.model, text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
         prompt, system = summary_prompt(text)
-        return await self._call(prompt, system)
+        out = await self._call(prompt, system)
+        if out:
+            self._cache.set(key, out)
+        return out
 
     async def analyze_sentiment(self, reviews: list[str]) -> str:
         if not reviews:
             return "No reviews yet."
+        key = sentiment_key(self.model, reviews)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
         prompt, system = sentiment_prompt(reviews)
-        return await self._call(prompt, system)
+        out = await self._call(prompt, system)
+        if out:
+            self._cache.set(key, out)
+        return out
 
     async def recommend_similar(self, book_info: str, candidates: list[dict], limit: int = 10) -> list[int]:
         if not candidates:
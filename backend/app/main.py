@@ -1,9 +1,38 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.config import settings
 from app.routers import auth, books, recommendations
 
-app = FastAPI(title="LuminaLib API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Dedicated executor for asyncio.to_thread work (password hashing, blocking
+    # storage calls) so it doesn't contend with Starlette's threadpool for sync routes.
+    executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+    asyncio.get_running_loop().set_default_executor(executor)
+    if settings.auto_create_tables:
+        # Dev-only: production runs `alembic upgrade head` instead of paying
+        # a per-table existence check on every worker boot.
+        from app import models  # noqa: F401  (register tables on Base.metadata)
+        from app.db import Base, engine
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield
+    from app.deps import get_llm
+
+    await get_llm().aclose()
+    executor.shutdown(wait=False)
+
+
+app = FastAPI(title="LuminaLib API", lifespan=lifespan, default_response_class=ORJSONResponse)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
 app.include_router(auth.router)
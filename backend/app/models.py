@@ -1,5 +1,17 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -10,25 +22,36 @@ class User(Base):
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    preferences = relationship("UserPreference", back_populates="user")
-    borrows = relationship("Borrow", back_populates="user")
-    reviews = relationship("Review", back_populates="user")
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # lazy="raise" so an accidental lazy load (an N+1 in the making under the
+    # async session) fails loudly instead of silently issuing per-row queries.
+    preferences = relationship("UserPreference", back_populates="user", lazy="raise")
+    borrows = relationship("Borrow", back_populates="user", lazy="raise")
+    reviews = relationship("Review", back_populates="user", lazy="raise")
 
 
 class UserPreference(Base):
     __tablename__ = "user_preferences"
+    __table_args__ = (
+        # One weight per user per genre; conflict target for the set_preference upsert.
+        UniqueConstraint("user_id", "genre", name="uq_user_preferences_user_genre"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     genre = Column(String(100), nullable=False)
     weight = Column(Float, default=1.0)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     user = relationship("User", back_populates="preferences")
 
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        # Ordered scan backing the newest-first top-N reads in listings and
+        # recommendations.
+        Index("ix_books_created_at", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False)
     author = Column(String(255), nullable=True)
@@ -37,8 +60,8 @@ class Book(Base):
     file_name = Column(String(255), nullable=True)
     summary = Column(Text, nullable=True)
     added_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     borrows = relationship("Borrow", back_populates="book")
     reviews = relationship("Review", back_populates="book")
     summary_record = relationship("BookSummary", back_populates="book", uselist=False)
@@ -50,16 +73,31 @@ class BookSummary(Base):
     id = Column(Integer, primary_key=True, index=True)
     book_id = Column(Integer, ForeignKey("books.id"), nullable=False)
     content = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     book = relationship("Book", back_populates="summary_record")
 
 
 class Borrow(Base):
     __tablename__ = "borrows"
+    __table_args__ = (
+        # Active-borrow checks hit only rows with returned_at IS NULL; the
+        # partial index keeps them as index-only lookups of a tiny relation.
+        Index(
+            "ix_borrows_active_user_book",
+            "user_id",
+            "book_id",
+            postgresql_where=text("returned_at IS NULL"),
+        ),
+        # Full (not partial) index backing the anti-join in recommendations,
+        # which has to consider returned borrows too.
+        Index("ix_borrows_user_book", "user_id", "book_id"),
+        # Peer lookups in collaborative scoring probe borrows by book_id.
+        Index("ix_borrows_book_id", "book_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     book_id = Column(Integer, ForeignKey("books.id"), nullable=False)
-    borrowed_at = Column(DateTime, default=datetime.utcnow)
+    borrowed_at = Column(DateTime, server_default=func.now())
     returned_at = Column(DateTime, nullable=True)
     user = relationship("User", back_populates="borrows")
     book = relationship("Book", back_populates="borrows")
@@ -67,12 +105,20 @@ class Borrow(Base):
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # One review per user per book; doubles as the index backing
+        # my-review lookups and the race-proof duplicate check.
+        UniqueConstraint("user_id", "book_id", name="uq_reviews_user_book"),
+        # Review listings and the sentiment task fetch by book_id alone, which
+        # the (user_id, book_id) unique index cannot serve.
+        Index("ix_reviews_book_id", "book_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     book_id = Column(Integer, ForeignKey("books.id"), nullable=False)
     rating = Column(Integer, nullable=False)
     text = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     user = relationship("User", back_populates="reviews")
     book = relationship("Book", back_populates="reviews")
 
@@ -82,6 +128,6 @@ class ReviewAnalysis(Base):
     id = Column(Integer, primary_key=True, index=True)
     book_id = Column(Integer, ForeignKey("books.id"), nullable=False)
     consensus = Column(Text, nullable=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     book = relationship("Book", back_populates="review_analysis")
 
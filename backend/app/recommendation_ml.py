@@ -4,19 +4,20 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
-from app.models import Book
+# Books only need their text columns here; both ORM Book instances and
+# column-projection Row objects satisfy the attribute access below.
 
 
-def _book_text(b: Book) -> str:
+def _book_text(b) -> str:
     parts = [b.title or "", b.author or "", b.genre or "", (b.summary or "")[:500]]
     return " ".join(parts).strip() or str(b.id)
 
 
 def similar_books(
-    books: Sequence[Book],
+    books: Sequence,
     book_id: int,
     limit: int = 10,
-) -> list[tuple[Book, float]]:
+) -> list[tuple]:
     books = list(books)
     if len(books) < 2:
         return []
@@ -41,28 +42,7 @@ def similar_books(
     return out
 
 
-def collaborative_scores(
-    user_borrowed_ids: set[int],
-    all_borrows: list[tuple[int, int]],
-    candidate_book_ids: set[int],
-) -> dict[int, float]:
-    if not user_borrowed_ids or not all_borrows:
-        return {bid: 0.0 for bid in candidate_book_ids}
-    user_to_books: dict[int, set[int]] = {}
-    for uid, bid in all_borrows:
-        user_to_books.setdefault(uid, set()).add(bid)
-    users_who_borrowed_mine = {
-        u for u, bset in user_to_books.items()
-        if bset & user_borrowed_ids
-    }
-    scores = {}
-    for bid in candidate_book_ids:
-        count = sum(1 for u in users_who_borrowed_mine if bid in user_to_books.get(u, set()))
-        scores[bid] = float(count)
-    return scores
-
-
-def build_book_matrix(books: list[Book]):
+def build_book_matrix(books: list):
     if not books:
         return None, None
     texts = [_book_text(b) for b in books]
@@ -75,7 +55,7 @@ def build_book_matrix(books: list[Book]):
 
 
 def content_similarity_to_user_books(
-    books: list[Book],
+    books: list,
     user_borrowed_ids: set[int],
     X,
 ) -> dict[int, float]:
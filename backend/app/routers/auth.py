@@ -1,41 +1,84 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.exc import IntegrityError
 
 from app.db import get_db
-from app.models import User
+from app.models import Borrow, Review, User
 from app.schemas import UserCreate, UserResponse, UserUpdate, TokenResponse, LoginRequest
-from app.auth import hash_password, verify_password, create_token
+from app.auth import (
+    create_token,
+    hash_password,
+    password_needs_rehash,
+    verify_dummy_password,
+    verify_password,
+)
 from app.deps import get_current_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Built once at import so the login hot path skips statement construction.
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
 
 @router.post("/signup", response_model=UserResponse)
 async def signup(data: UserCreate, db: AsyncSession = Depends(get_db)):
-    r = await db.execute(select(User).where(User.email == data.email))
-    if r.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    user = User(email=data.email, hashed_password=hash_password(data.password), full_name=data.full_name)
+    # Argon2 burns tens of ms of CPU; run it in a thread so the event loop stays free.
+    hashed = await asyncio.to_thread(hash_password, data.password)
+    user = User(email=data.email, hashed_password=hashed, full_name=data.full_name)
     db.add(user)
-    await db.commit()
+    # No pre-check SELECT: the unique index on email is the source of truth,
+    # which saves a round-trip and closes the check-then-insert race.
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     await db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
-    r = await db.execute(select(User).where(User.email == data.email))
+    r = await db.execute(USER_BY_EMAIL, {"email": data.email})
     user = r.scalar_one_or_none()
-    if not user or not verify_password(data.password, user.hashed_password):
+    if user:
+        valid = await asyncio.to_thread(verify_password, data.password, user.hashed_password)
+    else:
+        # Unknown email: run a dummy verification so timing doesn't reveal
+        # whether the address is registered.
+        valid = await asyncio.to_thread(verify_dummy_password, data.password)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if password_needs_rehash(user.hashed_password):
+        # Transparently upgrade hashes when Argon2 parameters are bumped.
+        user.hashed_password = await asyncio.to_thread(hash_password, data.password)
+        await db.commit()
     token = create_token({"sub": str(user.id)})
     return TokenResponse(access_token=token)
 
 
 @router.get("/me", response_model=UserResponse)
-async def me(user: User = Depends(get_current_user)):
-    return user
+async def me(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    # Counts come from one query with two scalar subqueries rather than
+    # materializing the borrow/review collections.
+    counts = await db.execute(
+        select(
+            select(func.count()).where(Borrow.user_id == user.id).scalar_subquery(),
+            select(func.count()).where(Review.user_id == user.id).scalar_subquery(),
+        )
+    )
+    borrowed, reviewed = counts.one()
+    return UserResponse(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        created_at=user.created_at,
+        books_borrowed_count=borrowed,
+        books_reviewed_count=reviewed,
+    )
 
 
 @router.put("/me", response_model=UserResponse)
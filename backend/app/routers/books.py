@@ -1,14 +1,19 @@
+import asyncio
+import hashlib
 import uuid
 from datetime import datetime
 from io import BytesIO
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import FileResponse, Response
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Form, BackgroundTasks
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from sqlalchemy import bindparam, exists, func, insert, literal, select, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.db import get_db
 from app.models import User, Book, Borrow, Review, BookSummary, ReviewAnalysis
 from app.schemas import (
+    BOOK_LIST_ADAPTER,
     BookCreate,
     BookDetailResponse,
     BookListResponse,
@@ -19,9 +24,13 @@ from app.schemas import (
     ReviewResponse,
 )
 from app.deps import get_current_user, get_optional_user, get_storage, get_llm
+from app.tasks import run_sentiment_task, run_summary_task
 
 router = APIRouter(prefix="/books", tags=["books"])
 
+# Built once at import so per-request work skips statement construction.
+BOOK_BY_ID = select(Book).where(Book.id == bindparam("book_id"))
+
 # Constants for text extraction
 MIN_CONTENT_LENGTH = 50
 MAX_PDF_PAGES = 50
@@ -29,6 +38,10 @@ MAX_PDF_TEXT_LENGTH = 12000
 MAX_TEXT_LENGTH = 8000
 MIN_EXTRACTED_TEXT_LENGTH = 100
 
+# Constants for streaming uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_SUMMARY_SOURCE_BYTES = 8 * 1024 * 1024
+
 # Constants for pagination
 DEFAULT_PAGE_LIMIT = 20
 MIN_PAGE_LIMIT = 1
@@ -38,27 +51,30 @@ MAX_PAGE_LIMIT = 100
 MIN_RATING = 1
 MAX_RATING = 5
 
+def _etag(*parts) -> str:
+    """Weak-ish entity tag from the fields that determine the response body."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
 
-def _extract_text_for_summary(content: bytes, filename: str | None) -> str | None:
-    """Extract plain text from file content for LLM summarization. Returns None if not usable."""
-    if not content or len(content) < MIN_CONTENT_LENGTH:
-        return None
-    ext = (filename or "").split(".")[-1].lower() if "." in (filename or "") else ""
-    if ext == "pdf":
-        try:
-            from pypdf import PdfReader
-            reader = PdfReader(BytesIO(content))
-            parts = []
-            for page in reader.pages[:MAX_PDF_PAGES]:
-                t = page.extract_text()
-                if t:
-                    parts.append(t)
-            text = "\n".join(parts).strip()[:MAX_PDF_TEXT_LENGTH]
-            if not text or text.startswith("%PDF") or len(text) < MIN_EXTRACTED_TEXT_LENGTH:
-                return None
-            return text
-        except Exception:  # PDF parsing can fail for various reasons
+
+def _parse_pdf(content: bytes) -> str | None:
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(BytesIO(content))
+        parts = []
+        for page in reader.pages[:MAX_PDF_PAGES]:
+            t = page.extract_text()
+            if t:
+                parts.append(t)
+        text = "\n".join(parts).strip()[:MAX_PDF_TEXT_LENGTH]
+        if not text or text.startswith("%PDF") or len(text) < MIN_EXTRACTED_TEXT_LENGTH:
             return None
+        return text
+    except Exception:  # PDF parsing can fail for various reasons
+        return None
+
+
+def _parse_text(content: bytes) -> str | None:
     try:
         text = content.decode("utf-8", errors="ignore").strip()[:MAX_TEXT_LENGTH]
         if not text or text.startswith("%PDF"):
@@ -68,57 +84,16 @@ def _extract_text_for_summary(content: bytes, filename: str | None) -> str | Non
         return None
 
 
-def _run_summary_task(book_id: int, text: str):
-    import asyncio
-    import threading
-    from app.db import SessionLocal
-    from app.deps import get_llm
-
-    async def _run():
-        llm = get_llm()
-        summary_text = await llm.summarize(text)
-        async with SessionLocal() as db:
-            from app.models import BookSummary, Book
-            summary_result = await db.execute(select(BookSummary).where(BookSummary.book_id == book_id))
-            summary_row = summary_result.scalar_one_or_none()
-            if summary_row:
-                summary_row.content = summary_text
-            else:
-                summary_row = BookSummary(book_id=book_id, content=summary_text)
-                db.add(summary_row)
-            book_result = await db.execute(select(Book).where(Book.id == book_id))
-            book = book_result.scalar_one()
-            book.summary = summary_text
-            await db.commit()
-
-    def run():
-        asyncio.run(_run())
-    threading.Thread(target=run, daemon=True).start()
-
-
-def _run_sentiment_task(book_id: int, review_texts: list[str]):
-    import asyncio
-    import threading
-    from app.db import SessionLocal
-    from app.deps import get_llm
-
-    async def _run():
-        llm = get_llm()
-        consensus = await llm.analyze_sentiment(review_texts)
-        async with SessionLocal() as db:
-            from app.models import ReviewAnalysis
-            analysis_result = await db.execute(select(ReviewAnalysis).where(ReviewAnalysis.book_id == book_id))
-            analysis_row = analysis_result.scalar_one_or_none()
-            if analysis_row:
-                analysis_row.consensus = consensus
-            else:
-                analysis_row = ReviewAnalysis(book_id=book_id, consensus=consensus)
-                db.add(analysis_row)
-            await db.commit()
-
-    def run():
-        asyncio.run(_run())
-    threading.Thread(target=run, daemon=True).start()
+# Extension -> parser; anything unknown falls back to a plain-text decode.
+_PARSERS = {"pdf": _parse_pdf}
+
+
+def _extract_text_for_summary(content: bytes, filename: str | None) -> str | None:
+    """Extract plain text from file content for LLM summarization. Returns None if not usable."""
+    if not content or len(content) < MIN_CONTENT_LENGTH:
+        return None
+    ext = (filename or "").split(".")[-1].lower() if "." in (filename or "") else ""
+    return _PARSERS.get(ext, _parse_text)(content)
 
 
 @router.post("", response_model=BookResponse)
@@ -134,12 +109,24 @@ async def create_book(
 ):
     file_path = None
     file_name = None
-    content = b""
+    summary_source = b""
     if file and file.filename:
         ext = file.filename.split(".")[-1] if "." in file.filename else "bin"
         key = f"books/{uuid.uuid4().hex}.{ext}"
-        content = await file.read()
-        await storage.put(key, BytesIO(content))
+        # Stream the upload to storage in fixed-size chunks instead of
+        # buffering the whole file; keep only a capped prefix in memory for
+        # summary extraction.
+        summary_buf = BytesIO()
+
+        async def chunks():
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                if summary_buf.tell() < MAX_SUMMARY_SOURCE_BYTES:
+                    summary_buf.write(chunk)
+                yield chunk
+
+        size = await storage.put_stream(key, chunks())
+        if size <= MAX_SUMMARY_SOURCE_BYTES:
+            summary_source = summary_buf.getvalue()
         file_path = key
         file_name = file.filename
 
@@ -155,16 +142,19 @@ async def create_book(
     await db.commit()
     await db.refresh(book)
 
-    if file_path and content:
-        text = _extract_text_for_summary(content, file_name)
-        if text:
-            background_tasks.add_task(_run_summary_task, book.id, text)
+    if file_path and summary_source:
+        # pypdf parsing is CPU-bound; keep it off the event loop.
+        summary_text = await asyncio.to_thread(_extract_text_for_summary, summary_source, file_name)
+        if summary_text:
+            background_tasks.add_task(run_summary_task, book.id, summary_text)
 
     return book
 
 
 @router.get("", response_model=BookListResponse)
 async def list_books(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = DEFAULT_PAGE_LIMIT,
     search: str = None,
@@ -179,10 +169,19 @@ async def list_books(
 
     # Apply search filter (search in title and author)
     if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            (Book.title.ilike(search_pattern)) | (Book.author.ilike(search_pattern))
-        )
+        if db.get_bind().dialect.name == "postgresql":
+            # Index-backed full-text search over the generated search_vec
+            # column (see migration 9f2c1a7d40b1) instead of a seq-scan ILIKE.
+            query = query.where(
+                text("books.search_vec @@ plainto_tsquery('simple', :search_q)").bindparams(
+                    search_q=search
+                )
+            )
+        else:
+            search_pattern = f"%{search}%"
+            query = query.where(
+                (Book.title.ilike(search_pattern)) | (Book.author.ilike(search_pattern))
+            )
 
     # Apply genre filter
     if genre:
@@ -192,26 +191,37 @@ async def list_books(
     if author:
         query = query.where(Book.author.ilike(f"%{author}%"))
 
-    # Get total count with filters
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Get paginated results
-    query = query.offset(skip).limit(limit).order_by(Book.created_at.desc())
+    # Single round-trip: a window count computes the filtered total alongside
+    # the page rows instead of re-running the filter in a separate COUNT query.
+    query = (
+        query.add_columns(func.count().over().label("total"))
+        .order_by(Book.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
     books_result = await db.execute(query)
-    items = books_result.scalars().all()
-
-    return BookListResponse(items=items, total=total, skip=skip, limit=limit)
+    rows = books_result.all()
+    total = rows[0].total if rows else 0
+    items = [row[0] for row in rows]
+
+    etag = _etag(skip, limit, search, genre, author, total, [(b.id, b.updated_at) for b in items])
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return BookListResponse(
+        items=BOOK_LIST_ADAPTER.validate_python(items), total=total, skip=skip, limit=limit
+    )
 
 
 @router.get("/{book_id}", response_model=BookDetailResponse)
 async def get_book(
     book_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     user: User | None = Depends(get_optional_user),
 ):
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
+    book_result = await db.execute(BOOK_BY_ID, {"book_id": book_id})
     book = book_result.scalar_one_or_none()
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
@@ -219,14 +229,18 @@ async def get_book(
     can_review = False
     my_review = None
     if user:
+        # EXISTS lets the active-borrow check resolve from the partial index
+        # without fetching the row.
         borrow_result = await db.execute(
-            select(Borrow).where(
-                Borrow.book_id == book_id,
-                Borrow.user_id == user.id,
-                Borrow.returned_at.is_(None),
+            select(
+                exists().where(
+                    Borrow.book_id == book_id,
+                    Borrow.user_id == user.id,
+                    Borrow.returned_at.is_(None),
+                )
             )
         )
-        currently_borrowed_by_me = borrow_result.scalar_one_or_none() is not None
+        currently_borrowed_by_me = bool(borrow_result.scalar())
         can_review = currently_borrowed_by_me  # true only when currently borrowed (no returned_at)
         review_result = await db.execute(
             select(Review).where(Review.book_id == book_id, Review.user_id == user.id).limit(1)
@@ -234,6 +248,18 @@ async def get_book(
         review_row = review_result.scalars().first()
         if review_row:
             my_review = MyReviewResponse(rating=review_row.rating, text=review_row.text)
+    # Conditional GET: everything user-visible is covered by these fields, so
+    # a matching If-None-Match skips serialization and the response body.
+    etag = _etag(
+        book.id,
+        book.updated_at,
+        user.id if user else None,
+        currently_borrowed_by_me,
+        my_review,
+    )
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return BookDetailResponse(
         id=book.id,
         title=book.title,
@@ -256,17 +282,33 @@ async def get_book_file(
     storage=Depends(get_storage),
 ):
     """Return the uploaded book file (text or PDF) for viewing. Requires auth."""
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
+    book_result = await db.execute(BOOK_BY_ID, {"book_id": book_id})
     book = book_result.scalar_one_or_none()
     if not book or not book.file_path:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book or file not found")
-    content = await storage.get(book.file_path)
-    if not content:
+    url = await storage.presigned_url(book.file_path)
+    if url:
+        # Time-limited direct URL: the file bytes go straight from the bucket
+        # to the client instead of being proxied through this process.
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    # Proxy fallback: stream in chunks so large files never sit fully in
+    # memory. Pulling the first chunk eagerly keeps the 404 path intact —
+    # missing keys fail before any response bytes are committed.
+    chunks = storage.stream(book.file_path)
+    try:
+        first = await anext(chunks)
+    except (FileNotFoundError, StopAsyncIteration):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    async def body():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
     file_name = book.file_name or "file"
     ext = file_name.split(".")[-1].lower() if "." in file_name else ""
     media_type = "application/pdf" if ext == "pdf" else "text/plain"
-    return Response(content=content, media_type=media_type, headers={"Content-Disposition": f'inline; filename="{file_name}"'})
+    return StreamingResponse(body(), media_type=media_type, headers={"Content-Disposition": f'inline; filename="{file_name}"'})
 
 
 @router.put("/{book_id}", response_model=BookResponse)
@@ -276,7 +318,7 @@ async def update_book(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
+    book_result = await db.execute(BOOK_BY_ID, {"book_id": book_id})
     book = book_result.scalar_one_or_none()
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
@@ -291,22 +333,25 @@ async def update_book(
     return book
 
 
-@router.delete("/{book_id}")
+@router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_book(
     book_id: int,
+    background_tasks: BackgroundTasks,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     storage=Depends(get_storage),
 ):
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
+    book_result = await db.execute(BOOK_BY_ID, {"book_id": book_id})
     book = book_result.scalar_one_or_none()
     if not book:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
-    if book.file_path:
-        await storage.delete(book.file_path)
+    file_path = book.file_path
     await db.delete(book)
     await db.commit()
-    return {"ok": True}
+    if file_path:
+        # Storage delete is idempotent; run it after the response instead of
+        # holding the request open for the storage round-trip.
+        background_tasks.add_task(storage.delete, file_path)
 
 
 @router.post("/{book_id}/borrow")
@@ -315,18 +360,29 @@ async def borrow_book(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
-    book = book_result.scalar_one_or_none()
-    if not book:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
-    existing_borrow_result = await db.execute(
-        select(Borrow).where(Borrow.book_id == book_id, Borrow.user_id == user.id, Borrow.returned_at.is_(None))
+    # Single guarded INSERT ... SELECT: the book-exists and no-active-borrow
+    # checks run inside the statement, which collapses three round-trips into
+    # one and removes the check-then-insert race.
+    guarded_select = select(literal(user.id), literal(book_id), func.now()).where(
+        exists(select(Book.id).where(Book.id == book_id)),
+        ~exists(
+            select(Borrow.id).where(
+                Borrow.book_id == book_id,
+                Borrow.user_id == user.id,
+                Borrow.returned_at.is_(None),
+            )
+        ),
+    )
+    result = await db.execute(
+        insert(Borrow).from_select(["user_id", "book_id", "borrowed_at"], guarded_select)
     )
-    if existing_borrow_result.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already borrowed")
-    borrow = Borrow(user_id=user.id, book_id=book_id)
-    db.add(borrow)
     await db.commit()
+    if result.rowcount == 0:
+        # Diagnose which guard failed to keep the original error responses.
+        book_exists = (await db.execute(select(exists().where(Book.id == book_id)))).scalar()
+        if not book_exists:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already borrowed")
     return {"ok": True}
 
 
@@ -353,11 +409,27 @@ async def get_reviews(
     db: AsyncSession = Depends(get_db),
 ):
     """Get all reviews for a book."""
+    # selectinload batches the reviewer lookup into one WHERE id IN (...) query
+    # instead of a lazy load per review row.
     reviews_result = await db.execute(
-        select(Review).where(Review.book_id == book_id).order_by(Review.created_at.desc())
+        select(Review)
+        .where(Review.book_id == book_id)
+        .options(selectinload(Review.user))
+        .order_by(Review.created_at.desc())
     )
     reviews = reviews_result.scalars().all()
-    return reviews
+    return [
+        ReviewResponse(
+            id=r.id,
+            user_id=r.user_id,
+            book_id=r.book_id,
+            rating=r.rating,
+            text=r.text,
+            created_at=r.created_at,
+            user_full_name=r.user.full_name if r.user else None,
+        )
+        for r in reviews
+    ]
 
 
 @router.post("/{book_id}/reviews", response_model=ReviewResponse)
@@ -368,35 +440,63 @@ async def create_review(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    borrow_result = await db.execute(
-        select(Borrow).where(Borrow.book_id == book_id, Borrow.user_id == user.id)
-    )
-    borrowed = borrow_result.scalars().first()
-    if not borrowed:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Must borrow book before reviewing")
     if data.rating < MIN_RATING or data.rating > MAX_RATING:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Rating must be {MIN_RATING}-{MAX_RATING}")
-    review = Review(user_id=user.id, book_id=book_id, rating=data.rating, text=data.text)
-    db.add(review)
-    await db.commit()
-    await db.refresh(review)
+    # Single guarded INSERT ... SELECT: the has-borrowed check runs inside the
+    # statement and the unique (user_id, book_id) constraint catches duplicate
+    # reviews, so the happy path is one round-trip.
+    guarded_select = select(
+        literal(user.id), literal(book_id), literal(data.rating), literal(data.text), func.now()
+    ).where(exists(select(Borrow.id).where(Borrow.book_id == book_id, Borrow.user_id == user.id)))
+    stmt = (
+        insert(Review)
+        .from_select(["user_id", "book_id", "rating", "text", "created_at"], guarded_select)
+        .returning(Review.id, Review.created_at)
+    )
+    try:
+        result = await db.execute(stmt)
+        row = result.first()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You have already reviewed this book")
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Must borrow book before reviewing")
 
-    reviews_result = await db.execute(select(Review).where(Review.book_id == book_id))
-    all_reviews = reviews_result.scalars().all()
-    texts = [r.text or f"Rating: {r.rating}" for r in all_reviews if r.text or r.rating]
-    if texts:
-        background_tasks.add_task(_run_sentiment_task, book_id, texts)
+    background_tasks.add_task(run_sentiment_task, book_id)
 
-    return review
+    return ReviewResponse(
+        id=row.id,
+        user_id=user.id,
+        book_id=book_id,
+        rating=data.rating,
+        text=data.text,
+        created_at=row.created_at,
+        user_full_name=user.full_name,
+    )
 
 
 @router.get("/{book_id}/analysis")
 async def get_analysis(book_id: int, db: AsyncSession = Depends(get_db)):
-    book_result = await db.execute(select(Book).where(Book.id == book_id))
-    book = book_result.scalar_one_or_none()
-    if not book:
+    # One round-trip for book + consensus, one for the rating aggregates.
+    # The aggregates run as a SQL GROUP BY instead of fetching review rows.
+    book_result = await db.execute(
+        select(Book, ReviewAnalysis.consensus)
+        .outerjoin(ReviewAnalysis, ReviewAnalysis.book_id == Book.id)
+        .where(Book.id == book_id)
+    )
+    row = book_result.first()
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
-    analysis_result = await db.execute(select(ReviewAnalysis).where(ReviewAnalysis.book_id == book_id))
-    review_analysis = analysis_result.scalar_one_or_none()
-    return {"summary": book.summary, "consensus": review_analysis.consensus if review_analysis else None}
+    book, consensus = row
+    stats_result = await db.execute(
+        select(func.count(Review.id), func.avg(Review.rating)).where(Review.book_id == book_id)
+    )
+    review_count, average_rating = stats_result.one()
+    return {
+        "summary": book.summary,
+        "consensus": consensus,
+        "review_count": review_count,
+        "average_rating": round(float(average_rating), 2) if average_rating is not None else None,
+    }
 
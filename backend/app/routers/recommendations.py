@@ -1,15 +1,17 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.db import get_db
+from app.db import SessionLocal, get_db
 from app.models import User, Book, UserPreference, Borrow
 from app.config import settings
 from app.deps import get_current_user, get_llm
 from app.schemas import PreferenceCreate
 from app.recommendation_ml import (
     similar_books,
-    collaborative_scores,
     content_similarity_to_user_books,
     build_book_matrix,
 )
@@ -20,6 +22,24 @@ router = APIRouter(tags=["recommendations"])
 MAX_BOOKS_FOR_ML = 500
 MAX_CANDIDATES_FOR_LLM = 80
 
+# Column projection used by the ML endpoints: skips ORM hydration and the
+# identity map since the rows are read-only scoring input.
+BOOK_COLS = (Book.id, Book.title, Book.author, Book.genre, Book.summary)
+
+
+async def _execute_one(stmt, no_bitmapscan: bool = False):
+    """Run one statement on its own pooled session.
+
+    A single AsyncSession cannot execute concurrently, so queries gathered
+    with asyncio.gather each check out their own connection.
+    """
+    async with SessionLocal() as session:
+        if no_bitmapscan and session.get_bind().dialect.name == "postgresql":
+            # Ordered top-N scans degrade badly under bitmap plans; SET LOCAL
+            # keeps the override scoped to this session's transaction.
+            await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        return await session.execute(stmt)
+
 
 def _norm(scores: dict[int, float]) -> dict[int, float]:
     if not scores:
@@ -43,12 +63,24 @@ async def set_preference(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    r = await db.execute(select(UserPreference).where(UserPreference.user_id == user.id, UserPreference.genre == data.genre))
-    row = r.scalar_one_or_none()
-    if row:
-        row.weight = data.weight
+    if db.get_bind().dialect.name == "postgresql":
+        # One round-trip upsert against the (user_id, genre) unique
+        # constraint; no SELECT-then-write race window.
+        await db.execute(
+            pg_insert(UserPreference)
+            .values(user_id=user.id, genre=data.genre, weight=data.weight)
+            .on_conflict_do_update(
+                index_elements=[UserPreference.user_id, UserPreference.genre],
+                set_={"weight": data.weight},
+            )
+        )
     else:
-        db.add(UserPreference(user_id=user.id, genre=data.genre, weight=data.weight))
+        r = await db.execute(select(UserPreference).where(UserPreference.user_id == user.id, UserPreference.genre == data.genre))
+        row = r.scalar_one_or_none()
+        if row:
+            row.weight = data.weight
+        else:
+            db.add(UserPreference(user_id=user.id, genre=data.genre, weight=data.weight))
     await db.commit()
     return {"ok": True}
 
@@ -99,20 +131,38 @@ async def get_recommendations(
     db: AsyncSession = Depends(get_db),
     llm: LLMBackend = Depends(get_llm),
 ):
-    borrowed = await db.execute(select(Borrow.book_id).where(Borrow.user_id == user.id))
-    borrowed_ids = {r[0] for r in borrowed.all()}
-
-    books_result = await db.execute(
-        select(Book).order_by(Book.created_at.desc()).limit(MAX_BOOKS_FOR_ML)
+    # Anti-join: the DB excludes already-borrowed books itself, so the borrow
+    # history never round-trips as a NOT IN parameter list.
+    has_borrowed = (
+        select(Borrow.id)
+        .where(Borrow.user_id == user.id, Borrow.book_id == Book.id)
+        .correlate(Book)
+        .exists()
     )
-    books = books_result.scalars().all()
-    candidates = [b for b in books if b.id not in borrowed_ids]
+    candidate_stmt = (
+        select(*BOOK_COLS).where(~has_borrowed).order_by(Book.created_at.desc()).limit(MAX_BOOKS_FOR_ML)
+    )
+    # The user's own books are still needed for the content-similarity profile.
+    borrowed_stmt = (
+        select(*BOOK_COLS).join(Borrow, Borrow.book_id == Book.id).where(Borrow.user_id == user.id).distinct()
+    )
+    pref_stmt = select(UserPreference).where(UserPreference.user_id == user.id)
+    # These three reads are independent; run them concurrently so the endpoint
+    # pays max(T_i) instead of sum(T_i).
+    candidates_result, borrowed_result, prefs_result = await asyncio.gather(
+        _execute_one(candidate_stmt, no_bitmapscan=True),
+        _execute_one(borrowed_stmt),
+        _execute_one(pref_stmt),
+    )
+    candidates = list(candidates_result.all())
     if not candidates:
         return []
+    borrowed_books = borrowed_result.all()
+    borrowed_ids = {b.id for b in borrowed_books}
+    books = candidates + list(borrowed_books)
+    pref_rows = prefs_result.scalars().all()
 
     if settings.recommendation_engine == "llm":
-        prefs = await db.execute(select(UserPreference).where(UserPreference.user_id == user.id))
-        pref_rows = prefs.scalars().all()
         pref_parts = [f"{p.genre} (weight {p.weight})" for p in pref_rows]
         pref_str = "Genres: " + ", ".join(pref_parts) if pref_parts else "No genre preferences set."
         candidate_dicts = [{"id": b.id, "title": b.title or "", "author": b.author or "", "genre": b.genre or ""} for b in candidates[:MAX_CANDIDATES_FOR_LLM]]
@@ -124,8 +174,6 @@ async def get_recommendations(
             for b in (book_by_id[bid],)
         ][:limit]
 
-    prefs = await db.execute(select(UserPreference).where(UserPreference.user_id == user.id))
-    pref_rows = prefs.scalars().all()
     genre_weights = {p.genre.lower(): p.weight for p in pref_rows} if pref_rows else {}
     candidate_ids = {b.id for b in candidates}
 
@@ -137,9 +185,21 @@ async def get_recommendations(
         preference_score[b.id] = s
     preference_score = _norm(preference_score)
 
-    all_borrows_result = await db.execute(select(Borrow.user_id, Borrow.book_id))
-    all_borrows = [(r[0], r[1]) for r in all_borrows_result.all()]
-    collab_score = collaborative_scores(borrowed_ids, all_borrows, candidate_ids)
+    # Collaborative scores as one GROUP BY: count, per candidate book, the
+    # distinct peers who share a borrow with this user, instead of pulling the
+    # whole borrows table into Python.
+    collab_score: dict[int, float] = {}
+    if borrowed_ids:
+        my_books = select(Borrow.book_id).where(Borrow.user_id == user.id).scalar_subquery()
+        peer_users = (
+            select(Borrow.user_id).where(Borrow.book_id.in_(my_books)).distinct().scalar_subquery()
+        )
+        collab_result = await db.execute(
+            select(Borrow.book_id, func.count(func.distinct(Borrow.user_id)))
+            .where(Borrow.user_id.in_(peer_users))
+            .group_by(Borrow.book_id)
+        )
+        collab_score = {bid: float(n) for bid, n in collab_result.all() if bid in candidate_ids}
     collab_score = _norm(collab_score)
 
     _, X = build_book_matrix(books)
@@ -170,12 +230,12 @@ async def get_similar_books(
     db: AsyncSession = Depends(get_db),
     llm: LLMBackend = Depends(get_llm),
 ):
-    r = await db.execute(select(Book).where(Book.id == book_id))
-    book = r.scalar_one_or_none()
+    r = await db.execute(select(*BOOK_COLS).where(Book.id == book_id))
+    book = r.first()
     if book is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
-    books_result = await db.execute(select(Book).order_by(Book.created_at.desc()).limit(MAX_BOOKS_FOR_ML))
-    books = books_result.scalars().all()
+    books_result = await db.execute(select(*BOOK_COLS).order_by(Book.created_at.desc()).limit(MAX_BOOKS_FOR_ML))
+    books = books_result.all()
     others = [b for b in books if b.id != book_id]
     if not others:
         return []
@@ -1,11 +1,13 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 
 class UserCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     email: EmailStr
-    password: str
+    password: str = Field(max_length=1024)
     full_name: Optional[str] = None
 
 
@@ -14,32 +16,41 @@ class UserResponse(BaseModel):
     email: str
     full_name: Optional[str] = None
     created_at: datetime
+    books_borrowed_count: int = 0
+    books_reviewed_count: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     full_name: Optional[str] = None
 
 
 class LoginRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     email: str
-    password: str
+    password: str = Field(max_length=1024)
 
 
 class TokenResponse(BaseModel):
     access_token: str
-    token_type: str = "bearer"
+    token_type: Literal["bearer"] = "bearer"
 
 
 class BookCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     title: str
     author: Optional[str] = None
     genre: Optional[str] = None
 
 
 class BookUpdate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     title: Optional[str] = None
     author: Optional[str] = None
     genre: Optional[str] = None
@@ -53,8 +64,7 @@ class BookResponse(BaseModel):
     summary: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MyReviewResponse(BaseModel):
@@ -76,7 +86,14 @@ class BookListResponse(BaseModel):
     limit: int
 
 
+# Built once at import; validating ORM rows through a shared adapter skips
+# re-building the list schema on every request.
+BOOK_LIST_ADAPTER = TypeAdapter(list[BookResponse])
+
+
 class ReviewCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     rating: int
     text: Optional[str] = None
 
@@ -88,12 +105,14 @@ class ReviewResponse(BaseModel):
     rating: int
     text: Optional[str] = None
     created_at: datetime
+    user_full_name: Optional[str] = None  # Reviewer display name (eager-loaded)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PreferenceCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     genre: str
     weight: float = 1.0
 
@@ -102,3 +121,11 @@ class AnalysisResponse(BaseModel):
     summary: Optional[str] = None
     consensus: Optional[str] = None
 
+
+# Warm-up: EmailStr compiles email_validator's regexes lazily on first use,
+# which would otherwise stall the first signup request in each worker.
+try:
+    UserCreate.model_validate({"email": "warmup@example.com", "password": "warmup"})
+except Exception:  # never let the warm-up block import
+    pass
+
@@ -1,5 +1,12 @@
+import tempfile
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO
+
+# Uploads larger than this spill from memory to disk while spooling.
+SPOOL_MAX_SIZE = 32 * 1024 * 1024
+
+# Chunk size for streamed downloads.
+STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 class StorageBackend(ABC):
@@ -7,10 +14,45 @@ class StorageBackend(ABC):
     async def put(self, key: str, content: BinaryIO, content_type: str = "") -> str:
         pass
 
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes], content_type: str = "") -> int:
+        """Store an async stream of chunks; returns bytes written.
+
+        Default implementation spools to a temp file (memory up to
+        SPOOL_MAX_SIZE, disk beyond) and delegates to put(), so backends only
+        need to override this when they support true chunked uploads.
+        """
+        size = 0
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            async for chunk in chunks:
+                spool.write(chunk)
+                size += len(chunk)
+            spool.seek(0)
+            await self.put(key, spool, content_type)
+        return size
+
+    async def presigned_url(self, key: str, expires_in: int = 3600) -> str | None:
+        """Return a direct, time-limited download URL, or None if the backend
+        can't issue one (callers then fall back to proxying the bytes)."""
+        return None
+
     @abstractmethod
     async def get(self, key: str) -> bytes | None:
         pass
 
+    async def stream(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Yield the object in chunks of at most chunk_size bytes.
+
+        Raises FileNotFoundError before the first yield when the key is
+        missing. Default implementation delegates to get(); backends that can
+        read incrementally override this so large downloads don't hold the
+        whole object in memory.
+        """
+        data = await self.get(key)
+        if data is None:
+            raise FileNotFoundError(key)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
     @abstractmethod
     async def delete(self, key: str) -> bool:
         pass
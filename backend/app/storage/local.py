@@ -1,7 +1,10 @@
+import asyncio
 from pathlib import Path
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO
 from app.storage.base import StorageBackend
 
+_CHUNK_SIZE = 1024 * 1024
+
 
 class LocalStorage(StorageBackend):
     def __init__(self, root: str):
@@ -14,16 +17,37 @@ class LocalStorage(StorageBackend):
     async def put(self, key: str, content: BinaryIO, content_type: str = "") -> str:
         path = self._path(key)
         path.parent.mkdir(parents=True, exist_ok=True)
+        # Copy in fixed-size chunks off the event loop; a whole-file read()
+        # would buffer the entire upload in memory and block the loop.
         with open(path, "wb") as f:
-            f.write(content.read())
+            while chunk := await asyncio.to_thread(content.read, _CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
         return key
 
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes], content_type: str = "") -> int:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = 0
+        with open(path, "wb") as f:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                size += len(chunk)
+        return size
+
     async def get(self, key: str) -> bytes | None:
         path = self._path(key)
         if not path.exists():
             return None
         return path.read_bytes()
 
+    async def stream(self, key: str, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+        path = self._path(key)
+        if not path.exists():
+            raise FileNotFoundError(key)
+        with open(path, "rb") as f:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+
     async def delete(self, key: str) -> bool:
         path = self._path(key)
         if path.exists():
@@ -1,8 +1,32 @@
 import asyncio
-from typing import BinaryIO
-from app.storage.base import StorageBackend
+from typing import AsyncIterator, BinaryIO
+from app.storage.base import StorageBackend, STREAM_CHUNK_SIZE
 from app.config import settings
 
+# One client per region, shared across provider instances and threads
+# (boto3 clients are thread-safe); each fresh client would otherwise build
+# its own session, endpoint, and 10-connection urllib3 pool.
+_clients: dict[str, object] = {}
+
+
+def _shared_client(region: str):
+    client = _clients.get(region)
+    if client is None:
+        import boto3
+        from botocore.config import Config
+
+        client = boto3.client(
+            "s3",
+            region_name=region,
+            config=Config(
+                max_pool_connections=settings.s3_max_pool_connections,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+                tcp_keepalive=True,
+            ),
+        )
+        _clients[region] = client
+    return client
+
 
 class S3Storage(StorageBackend):
     def __init__(self):
@@ -10,23 +34,45 @@ class S3Storage(StorageBackend):
             raise ValueError("AWS_BUCKET must be set when STORAGE_BACKEND=s3")
         self.bucket = settings.aws_bucket
         self.region = settings.aws_region or "us-east-1"
+        self._transfer_config = None
+
+    def _tcfg(self):
+        # Bounded 8 MiB parts: uploads stream from the file object instead of
+        # accumulating in memory, with parallel part uploads past the threshold.
+        if self._transfer_config is None:
+            from boto3.s3.transfer import TransferConfig
+            self._transfer_config = TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=8,
+                use_threads=True,
+            )
+        return self._transfer_config
 
     def _client(self):
-        import boto3
-        return boto3.client("s3", region_name=self.region)
+        return _shared_client(self.region)
 
     async def put(self, key: str, content: BinaryIO, content_type: str = "") -> str:
         client = self._client()
-        body = content.read()
         await asyncio.to_thread(
-            client.put_object,
-            Bucket=self.bucket,
-            Key=key,
-            Body=body,
-            ContentType=content_type or "application/octet-stream",
+            client.upload_fileobj,
+            content,
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": content_type or "application/octet-stream"},
+            Config=self._tcfg(),
         )
         return key
 
+    async def presigned_url(self, key: str, expires_in: int = 3600) -> str | None:
+        client = self._client()
+        return await asyncio.to_thread(
+            client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
     async def get(self, key: str) -> bytes | None:
         from botocore.exceptions import ClientError
         client = self._client()
@@ -36,12 +82,35 @@ class S3Storage(StorageBackend):
                 Bucket=self.bucket,
                 Key=key,
             )
-            return resp["Body"].read()
+            # The body is a lazy network stream; read it off the loop too.
+            return await asyncio.to_thread(resp["Body"].read)
         except ClientError as e:
             if e.response.get("Error", {}).get("Code") == "NoSuchKey":
                 return None
             raise
 
+    async def stream(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        from botocore.exceptions import ClientError
+        client = self._client()
+        try:
+            resp = await asyncio.to_thread(
+                client.get_object,
+                Bucket=self.bucket,
+                Key=key,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchKey":
+                raise FileNotFoundError(key) from e
+            raise
+        # Chunked reads off the lazy body stream keep peak memory at
+        # chunk_size regardless of object size.
+        body = resp["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
     async def delete(self, key: str) -> bool:
         client = self._client()
         try:
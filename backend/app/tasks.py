@@ -0,0 +1,93 @@
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.db import SessionLocal
+from app.deps import get_llm
+from app.models import Book, BookSummary, Review, ReviewAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Caps in-flight LLM calls across background tasks so a burst of uploads or
+# reviews doesn't trip provider rate limits. The tasks all run on the request
+# loop now, so an asyncio primitive is the right one.
+_LLM_SEMAPHORE = asyncio.Semaphore(settings.llm_max_concurrency)
+
+# Per-review cap applied once, up front, so oversized reviews don't inflate
+# the prompt (or fragment the cache key) downstream.
+MAX_REVIEW_CHARS = 2000
+
+
+async def run_summary_task(book_id: int, text: str) -> None:
+    """Summarize extracted book text and persist it (BackgroundTasks target)."""
+    # Failures are logged with context rather than raised: BackgroundTasks
+    # runs after the response is sent, so an exception here would only
+    # surface as an unhandled-error traceback with no request tied to it.
+    try:
+        await _summarize_and_store(book_id, text)
+    except Exception:
+        logger.exception("summary task failed for book_id=%s", book_id)
+
+
+async def run_sentiment_task(book_id: int) -> None:
+    """Recompute the review consensus for a book (BackgroundTasks target)."""
+    try:
+        await _analyze_and_store(book_id)
+    except Exception:
+        logger.exception("sentiment task failed for book_id=%s", book_id)
+
+
+async def _summarize_and_store(book_id: int, text: str) -> None:
+    llm = get_llm()
+    async with _LLM_SEMAPHORE:
+        summary_text = await llm.summarize(text)
+    async with SessionLocal() as db:
+        # Direct UPDATEs: nothing is hydrated into the session just to flip
+        # two columns, and the rowcount doubles as the existence check.
+        book_updated = await db.execute(
+            update(Book).where(Book.id == book_id).values(summary=summary_text)
+        )
+        if book_updated.rowcount == 0:
+            # Book was deleted while the LLM call was in flight.
+            return
+        summary_updated = await db.execute(
+            update(BookSummary)
+            .where(BookSummary.book_id == book_id)
+            .values(content=summary_text)
+        )
+        if summary_updated.rowcount == 0:
+            db.add(BookSummary(book_id=book_id, content=summary_text))
+        await db.commit()
+
+
+async def _analyze_and_store(book_id: int) -> None:
+    # No session is held across the LLM call; each phase checks one out
+    # briefly so slow models don't pin pool connections.
+    async with SessionLocal() as db:
+        reviews_result = await db.execute(
+            select(Review.text, Review.rating).where(Review.book_id == book_id)
+        )
+        all_reviews = reviews_result.all()
+    # Filter and truncate in one pass; the same list feeds both the cache key
+    # and the prompt, so no review is re-processed per call.
+    review_texts = [
+        (r.text or f"Rating: {r.rating}")[:MAX_REVIEW_CHARS]
+        for r in all_reviews
+        if r.text or r.rating
+    ]
+    if not review_texts:
+        return
+    llm = get_llm()
+    async with _LLM_SEMAPHORE:
+        consensus = await llm.analyze_sentiment(review_texts)
+    async with SessionLocal() as db:
+        analysis_updated = await db.execute(
+            update(ReviewAnalysis)
+            .where(ReviewAnalysis.book_id == book_id)
+            .values(consensus=consensus)
+        )
+        if analysis_updated.rowcount == 0:
+            db.add(ReviewAnalysis(book_id=book_id, consensus=consensus))
+        await db.commit()